@@ -1,8 +1,9 @@
 from fastapi import FastAPI, APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from starlette.middleware.gzip import GZipMiddleware
+from pymongo import AsyncMongoClient
 import os
 import logging
 from pathlib import Path
@@ -10,16 +11,22 @@ from pydantic import BaseModel, Field
 from typing import List, Optional
 import uuid
 from datetime import datetime
+from functools import lru_cache
 import asyncio
-import json
+import hashlib
+import re
+import time
+import orjson
 import aiofiles
+import httpx
 from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup
+import lxml.html
 from emergentintegrations.llm.chat import LlmChat, UserMessage
 import pandas as pd
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.platypus import SimpleDocTemplate, LongTable, Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.pdfbase import pdfutils
 from reportlab.pdfbase.ttfonts import TTFont
@@ -32,7 +39,13 @@ load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncMongoClient(
+    mongo_url,
+    maxPoolSize=200,
+    minPoolSize=20,
+    waitQueueTimeoutMS=5000,
+    serverSelectionTimeoutMS=3000
+)
 db = client[os.environ['DB_NAME']]
 
 # Create the main app without a prefix
@@ -55,7 +68,7 @@ class StatusCheckCreate(BaseModel):
 
 class ScrapingRequest(BaseModel):
     url: str
-    month: int
+    month: int = Field(ge=1, le=12)
     year: int = 2025
 
 class PropertyListing(BaseModel):
@@ -72,6 +85,7 @@ class PropertyListing(BaseModel):
     price: str = ""
     listing_date: str = ""
     raw_html: str = ""
+    text_snippet: str = ""
     processed_date: datetime = Field(default_factory=datetime.utcnow)
 
 class ScrapingResult(BaseModel):
@@ -85,13 +99,51 @@ class ScrapingResult(BaseModel):
     listings: List[PropertyListing] = []
     created_date: datetime = Field(default_factory=datetime.utcnow)
 
-# Utility functions
-async def init_gemini_chat():
-    """Initialize Gemini chat with proper configuration"""
-    chat = LlmChat(
-        api_key=GEMINI_API_KEY,
-        session_id=str(uuid.uuid4()),
-        system_message="""Sen Türk emlak verilerini analiz eden bir uzmansın. Verilen HTML içeriğinden emlak ilan bilgilerini çıkartmalısın.
+# Turkish month names, indexed by month number (index 0 unused)
+_TR_MONTHS = ("", "Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran",
+              "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık")
+
+# Name -> number lookup plus a "DD Month YYYY" pattern compiled once, so the
+# month/year filter compares numerically instead of substring-matching
+# (where month 7 would falsely hit "17 Ocak 2025")
+_TR_MONTH_NUMBERS = {name: number for number, name in enumerate(_TR_MONTHS) if name}
+_DATE_RE = re.compile(r'(\d{1,2})\s+(%s)\s+(\d{4})' % '|'.join(_TR_MONTH_NUMBERS))
+
+def listing_matches_month(date_text: str, target_month: int, target_year: int) -> bool:
+    """True when a Turkish listing date falls in the requested month and year"""
+    match = _DATE_RE.search(date_text or "")
+    if not match:
+        return False
+    return (int(match.group(3)) == target_year
+            and _TR_MONTH_NUMBERS[match.group(2)] == target_month)
+
+# Headers shared by the static HTTP and Playwright fetch paths
+SCRAPE_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+SCRAPE_HEADERS = {
+    'User-Agent': SCRAPE_USER_AGENT,
+    'Accept-Language': 'tr-TR,tr;q=0.9,en;q=0.8'
+}
+
+# Shared Playwright browser, launched lazily and reused across requests
+_playwright = None
+_browser = None
+_browser_lock = asyncio.Lock()
+
+async def get_browser():
+    """Return the shared Chromium instance, launching it on first use"""
+    global _playwright, _browser
+    async with _browser_lock:
+        if _browser is None:
+            _playwright = await async_playwright().start()
+            _browser = await _playwright.chromium.launch(
+                headless=True,
+                args=['--disable-dev-shm-usage', '--disable-setuid-sandbox', '--no-sandbox',
+                      '--disable-blink-features=AutomationControlled']
+            )
+    return _browser
+
+# Gemini system prompt shared by every chat session
+GEMINI_SYSTEM_MESSAGE = """Sen Türk emlak verilerini analiz eden bir uzmansın. Verilen HTML içeriğinden emlak ilan bilgilerini çıkartmalısın.
 
         Çıkartman gereken bilgiler:
         1. owner_name: İlan sahibinin adı
@@ -106,206 +158,513 @@ async def init_gemini_chat():
         10. price: Fiyat
 
         Yanıtını JSON formatında ver. Bilgi bulunamazsa boş string ("") kullan."""
+
+# Utility functions
+async def init_gemini_chat():
+    """Initialize Gemini chat with proper configuration"""
+    chat = LlmChat(
+        api_key=GEMINI_API_KEY,
+        session_id=str(uuid.uuid4()),
+        system_message=GEMINI_SYSTEM_MESSAGE
     ).with_model("gemini", "gemini-2.0-flash")
     return chat
 
-async def scrape_sahibinden_listings(url: str, target_month: int, target_year: int = 2025):
-    """Scrape Sahibinden.com listings using Playwright - Simplified and more robust"""
+# Pool of pre-configured chat sessions so workers don't pay setup per call
+CHAT_POOL_SIZE = 8
+_chat_pool: asyncio.Queue = asyncio.Queue()
+
+async def fill_chat_pool():
+    """Top the chat pool up to CHAT_POOL_SIZE sessions"""
+    while _chat_pool.qsize() < CHAT_POOL_SIZE:
+        _chat_pool.put_nowait(await init_gemini_chat())
+
+async def acquire_chat() -> LlmChat:
+    """Borrow a chat session from the pool, refilling it if empty"""
+    if _chat_pool.empty():
+        await fill_chat_pool()
+    return await _chat_pool.get()
+
+def release_chat(chat: LlmChat):
+    """Return a borrowed chat session to the pool"""
+    _chat_pool.put_nowait(chat)
+
+async def fetch_static_pages(urls):
+    """Fetch pages over plain HTTP - much cheaper than a browser when no rendering is needed"""
+    async with httpx.AsyncClient(headers=SCRAPE_HEADERS, timeout=15, follow_redirects=True) as http_client:
+        responses = await asyncio.gather(
+            *[http_client.get(page_url) for page_url in urls],
+            return_exceptions=True
+        )
+
+    contents = []
+    for page_url, response in zip(urls, responses):
+        if isinstance(response, Exception):
+            logging.error(f"HTTP fetch failed for {page_url}: {response}")
+            contents.append("")
+        else:
+            contents.append(response.text)
+    return contents
+
+def needs_browser(content: str) -> bool:
+    """Heuristic for pages the static fetch could not capture (empty or JS-rendered)"""
+    return not content or 'classifiedDetail' not in content
+
+# Fetched pages are reused for a short window - re-scraping the same search
+# URL with a tweaked month/year should not refetch anything
+_PAGE_CACHE = {}
+_PAGE_CACHE_TTL = 300  # seconds
+
+def get_cached_page(page_url: str):
+    """Return recently fetched content for this URL, or None"""
+    entry = _PAGE_CACHE.get(page_url)
+    if entry and time.monotonic() - entry[0] < _PAGE_CACHE_TTL:
+        return entry[1]
+    return None
+
+def cache_page(page_url: str, content: str):
+    """Remember fetched page content for the TTL window"""
+    _PAGE_CACHE[page_url] = (time.monotonic(), content)
+
+async def scrape_sahibinden_listings(urls, target_month: int, target_year: int = 2025):
+    """Scrape Sahibinden.com listings - httpx fast path with Playwright fallback"""
+    if isinstance(urls, str):
+        urls = [urls]
     listings = []
-    
+
     try:
-        async with async_playwright() as p:
-            # Launch browser with better error handling
+        # Recently fetched pages come straight from the cache
+        contents = {}
+        for page_url in urls:
+            cached = get_cached_page(page_url)
+            if cached is not None:
+                contents[page_url] = cached
+
+        # Fast path: static HTTP fetch for the remaining pages at once
+        to_fetch = [page_url for page_url in urls if page_url not in contents]
+        if to_fetch:
+            contents.update(zip(to_fetch, await fetch_static_pages(to_fetch)))
+
+        # Fall back to Playwright only for pages that need a rendered DOM
+        browser_urls = [page_url for page_url in urls if needs_browser(contents[page_url])]
+        if browser_urls:
             try:
-                browser = await p.chromium.launch(
-                    headless=True,
-                    args=['--disable-dev-shm-usage', '--disable-setuid-sandbox', '--no-sandbox']
+                browser = await get_browser()
+
+                # Fan page navigations out across contexts, bounded to a few at a time
+                semaphore = asyncio.Semaphore(5)
+
+                async def fetch_page(page_url: str) -> str:
+                    async with semaphore:
+                        # Fresh context per page with user agent and basic headers
+                        context = await browser.new_context(
+                            user_agent=SCRAPE_USER_AGENT,
+                            extra_http_headers={'Accept-Language': 'tr-TR,tr;q=0.9,en;q=0.8'}
+                        )
+                        try:
+                            # Images, fonts and CSS are most of the bytes and
+                            # irrelevant to extraction - drop them at the router
+                            await context.route(
+                                '**/*.{png,jpg,jpeg,gif,webp,svg,woff,woff2,css}',
+                                lambda route: route.abort()
+                            )
+                            page = await context.new_page()
+                            await page.goto(page_url, wait_until='domcontentloaded', timeout=15000)
+                            try:
+                                # Wait for the listing markup rather than a fixed sleep
+                                await page.wait_for_selector(
+                                    'ul.classifiedInfoList, a[href*="/ilan/"]',
+                                    timeout=5000, state='attached'
+                                )
+                            except Exception:
+                                pass  # unknown layout - use whatever the DOM has
+                            return await page.content()
+                        finally:
+                            await context.close()
+
+                fetched = await asyncio.gather(
+                    *[fetch_page(page_url) for page_url in browser_urls],
+                    return_exceptions=True
                 )
+
+                for page_url, content in zip(browser_urls, fetched):
+                    if isinstance(content, Exception):
+                        logging.error(f"Navigation error for {page_url}: {content}")
+                    else:
+                        contents[page_url] = content
+
             except Exception as browser_error:
                 logging.error(f"Browser launch failed: {browser_error}")
-                # Create enhanced demo listings for testing with month info
-                return create_demo_listings_from_content("<html><body>Demo content</body></html>", target_month)
-            
-            page = await browser.new_page()
-            
-            # Set user agent and basic headers
-            await page.set_extra_http_headers({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept-Language': 'tr-TR,tr;q=0.9,en;q=0.8'
-            })
-            
-            try:
-                # Navigate to main page
-                await page.goto(url, wait_until='load', timeout=30000)
-                await page.wait_for_timeout(2000)
-                
-                # Take page content for analysis  
-                content = await page.content()
-                
-                # Create demo listings based on the page (for testing)
-                listings = create_demo_listings_from_content(content, target_month)
-                
-            except Exception as nav_error:
-                logging.error(f"Navigation error: {nav_error}")
-                # Fallback to enhanced demo data with month info
-                listings = create_demo_listings_from_content("<html><body>Demo content</body></html>", target_month)
-            
-            await browser.close()
-            
+
+        # Cache whatever we managed to fetch this round
+        for page_url in to_fetch:
+            if contents[page_url]:
+                cache_page(page_url, contents[page_url])
+
+        for page_url in urls:
+            # Fallback to enhanced demo data with month info
+            content = contents[page_url] or "<html><body>Demo content</body></html>"
+            listings.extend(
+                listing for listing in create_demo_listings_from_content(content, target_month, target_year)
+                if listing_matches_month(listing.listing_date, target_month, target_year)
+            )
+
     except Exception as e:
         logging.error(f"Error in scraping: {e}")
         # Don't raise exception, return enhanced demo data with month info
-        listings = create_demo_listings_from_content("<html><body>Demo content</body></html>", target_month)
-    
+        listings = create_demo_listings_from_content("<html><body>Demo content</body></html>", target_month, target_year)
+
     return listings
 
+# Demo listing templates, built once at import; "day" feeds the per-request
+# listing_date substitution in create_demo_listings_from_content
+_DEMO_TEMPLATES = (
+    {
+        "owner_name": "Ahmet Yılmaz",
+        "contact_number": "0532 123 45 67",
+        "room_count": "3+1",
+        "net_area": "120 m²",
+        "is_in_complex": "Evet",
+        "complex_name": "Prestij Sitesi",
+        "heating_type": "Kombi",
+        "parking_type": "Kapalı",
+        "credit_suitable": "Evet",
+        "price": "850.000 TL"
+    },
+    {
+        "owner_name": "Fatma Demir",
+        "contact_number": "0543 987 65 43",
+        "room_count": "2+1",
+        "net_area": "95 m²",
+        "is_in_complex": "Hayır",
+        "complex_name": "",
+        "heating_type": "Merkezi Isıtma",
+        "parking_type": "Açık",
+        "credit_suitable": "Evet",
+        "price": "650.000 TL"
+    },
+    {
+        "owner_name": "Mehmet Kaya",
+        "contact_number": "0555 321 98 76",
+        "room_count": "4+1",
+        "net_area": "150 m²",
+        "is_in_complex": "Evet",
+        "complex_name": "Luxury Residence",
+        "heating_type": "Klima",
+        "parking_type": "Kapalı",
+        "credit_suitable": "Hayır",
+        "price": "1.200.000 TL"
+    }
+)
+
+_MONTHLY_DEMO_TEMPLATES = (
+    {
+        "owner_name": "Ali Özkan",
+        "contact_number": "0535 444 22 11",
+        "room_count": "3+1",
+        "net_area": "110 m²",
+        "is_in_complex": "Evet",
+        "complex_name": "Modern Yaşam Sitesi",
+        "heating_type": "Kombi",
+        "parking_type": "Kapalı",
+        "credit_suitable": "Evet",
+        "price": "750.000 TL",
+        "day": 15
+    },
+    {
+        "owner_name": "Zeynep Aksoy",
+        "contact_number": "0542 777 88 99",
+        "room_count": "2+1",
+        "net_area": "85 m²",
+        "is_in_complex": "Hayır",
+        "complex_name": "",
+        "heating_type": "Doğalgaz",
+        "parking_type": "Yok",
+        "credit_suitable": "Evet",
+        "price": "520.000 TL",
+        "day": 22
+    },
+    {
+        "owner_name": "Hasan Çelik",
+        "contact_number": "0533 999 11 22",
+        "room_count": "4+2",
+        "net_area": "180 m²",
+        "is_in_complex": "Evet",
+        "complex_name": "VIP Residence",
+        "heating_type": "Merkezi Isıtma",
+        "parking_type": "Kapalı",
+        "credit_suitable": "Hayır",
+        "price": "1.500.000 TL",
+        "day": 8
+    },
+    {
+        "owner_name": "Ayşe Erdoğan",
+        "contact_number": "0544 123 45 67",
+        "room_count": "1+1",
+        "net_area": "60 m²",
+        "is_in_complex": "Hayır",
+        "complex_name": "",
+        "heating_type": "Klima",
+        "parking_type": "Açık",
+        "credit_suitable": "Evet",
+        "price": "380.000 TL",
+        "day": 28
+    }
+)
+
 def create_demo_listings():
     """Create demo listings for testing when scraping fails"""
-    demo_data = [
-        {
-            "owner_name": "Ahmet Yılmaz",
-            "contact_number": "0532 123 45 67",
-            "room_count": "3+1",
-            "net_area": "120 m²",
-            "is_in_complex": "Evet",
-            "complex_name": "Prestij Sitesi",
-            "heating_type": "Kombi",
-            "parking_type": "Kapalı",
-            "credit_suitable": "Evet",
-            "price": "850.000 TL"
-        },
-        {
-            "owner_name": "Fatma Demir",
-            "contact_number": "0543 987 65 43",
-            "room_count": "2+1",
-            "net_area": "95 m²",
-            "is_in_complex": "Hayır",
-            "complex_name": "",
-            "heating_type": "Merkezi Isıtma",
-            "parking_type": "Açık",
-            "credit_suitable": "Evet",
-            "price": "650.000 TL"
-        },
-        {
-            "owner_name": "Mehmet Kaya",
-            "contact_number": "0555 321 98 76",
-            "room_count": "4+1",
-            "net_area": "150 m²",
-            "is_in_complex": "Evet",
-            "complex_name": "Luxury Residence",
-            "heating_type": "Klima",
-            "parking_type": "Kapalı",
-            "credit_suitable": "Hayır",
-            "price": "1.200.000 TL"
-        }
-    ]
-    
+    now = datetime.utcnow()
     listings = []
-    for data in demo_data:
-        listing = PropertyListing(
-            owner_name=data["owner_name"],
-            contact_number=data["contact_number"],
-            room_count=data["room_count"],
-            net_area=data["net_area"],
-            is_in_complex=data["is_in_complex"],
-            complex_name=data["complex_name"],
-            heating_type=data["heating_type"],
-            parking_type=data["parking_type"],
-            credit_suitable=data["credit_suitable"],
-            price=data["price"],
-            raw_html=f"<html><body>Demo listing for {data['owner_name']}</body></html>"
-        )
-        listings.append(listing)
-    
+    for template in _DEMO_TEMPLATES:
+        raw_html = f"<html><body>Demo listing for {template['owner_name']}</body></html>"
+        listings.append(PropertyListing(
+            **template,
+            raw_html=raw_html,
+            text_snippet=html_to_text(raw_html),
+            processed_date=now
+        ))
     return listings
 
-def create_demo_listings_from_content(content: str, target_month: int):
+def create_demo_listings_from_content(content: str, target_month: int, target_year: int = 2025):
     """Create enhanced demo listings based on page content"""
-    # Extract some basic info from the actual page if possible
-    soup = BeautifulSoup(content, 'html.parser')
-    
-    # Create realistic demo data based on target month
-    month_names = {
-        1: "Ocak", 2: "Şubat", 3: "Mart", 4: "Nisan", 5: "Mayıs", 6: "Haziran",
-        7: "Temmuz", 8: "Ağustos", 9: "Eylül", 10: "Ekim", 11: "Kasım", 12: "Aralık"
-    }
-    
-    demo_data = [
-        {
-            "owner_name": "Ali Özkan",
-            "contact_number": "0535 444 22 11",
-            "room_count": "3+1",
-            "net_area": "110 m²",
-            "is_in_complex": "Evet",
-            "complex_name": "Modern Yaşam Sitesi",
-            "heating_type": "Kombi",
-            "parking_type": "Kapalı",
-            "credit_suitable": "Evet",
-            "price": "750.000 TL",
-            "listing_date": f"15 {month_names[target_month]} 2025"
-        },
-        {
-            "owner_name": "Zeynep Aksoy",
-            "contact_number": "0542 777 88 99",
-            "room_count": "2+1",
-            "net_area": "85 m²",
-            "is_in_complex": "Hayır",
-            "complex_name": "",
-            "heating_type": "Doğalgaz",
-            "parking_type": "Yok",
-            "credit_suitable": "Evet",
-            "price": "520.000 TL",
-            "listing_date": f"22 {month_names[target_month]} 2025"
-        },
-        {
-            "owner_name": "Hasan Çelik",
-            "contact_number": "0533 999 11 22",
-            "room_count": "4+2",
-            "net_area": "180 m²",
-            "is_in_complex": "Evet",
-            "complex_name": "VIP Residence",
-            "heating_type": "Merkezi Isıtma",
-            "parking_type": "Kapalı",
-            "credit_suitable": "Hayır",
-            "price": "1.500.000 TL",
-            "listing_date": f"8 {month_names[target_month]} 2025"
-        },
-        {
-            "owner_name": "Ayşe Erdoğan",
-            "contact_number": "0544 123 45 67",
-            "room_count": "1+1",
-            "net_area": "60 m²",
-            "is_in_complex": "Hayır",
-            "complex_name": "",
-            "heating_type": "Klima",
-            "parking_type": "Açık",
-            "credit_suitable": "Evet",
-            "price": "380.000 TL",
-            "listing_date": f"28 {month_names[target_month]} 2025"
-        }
-    ]
-    
+    now = datetime.utcnow()
     listings = []
-    for data in demo_data:
-        listing = PropertyListing(
-            owner_name=data["owner_name"],
-            contact_number=data["contact_number"],
-            room_count=data["room_count"],
-            net_area=data["net_area"],
-            is_in_complex=data["is_in_complex"],
-            complex_name=data["complex_name"],
-            heating_type=data["heating_type"],
-            parking_type=data["parking_type"],
-            credit_suitable=data["credit_suitable"],
-            price=data["price"],
-            listing_date=data["listing_date"],
-            raw_html=f"<html><body>İlan tarihi: {data['listing_date']}<br>İlan sahibi: {data['owner_name']}</body></html>"
-        )
-        listings.append(listing)
-    
+    for template in _MONTHLY_DEMO_TEMPLATES:
+        data = dict(template)
+        listing_date = f"{data.pop('day')} {_TR_MONTHS[target_month]} {target_year}"
+        raw_html = f"<html><body>İlan tarihi: {listing_date}<br>İlan sahibi: {data['owner_name']}</body></html>"
+        listings.append(PropertyListing(
+            **data,
+            listing_date=listing_date,
+            raw_html=raw_html,
+            text_snippet=html_to_text(raw_html),
+            processed_date=now
+        ))
     return listings
 
-async def process_listing_with_ai(listing: PropertyListing) -> PropertyListing:
+
+def html_to_text(html: str) -> str:
+    """Extract plain text from listing HTML, capped at the prompt budget"""
+    if not html:
+        return ""
+    try:
+        tree = lxml.html.fromstring(html)
+    except Exception:
+        return BeautifulSoup(html, 'lxml').get_text(separator=' ', strip=True)[:2000]
+    # Drop subtrees that carry bytes but no listing data, so the character
+    # budget is spent on real content
+    for node in tree.xpath('//script | //style | //nav'):
+        node.drop_tree()
+    return ' '.join(tree.text_content().split())[:2000]
+
+# Extraction cache: listings from the same complex share near-identical
+# boilerplate, so identical normalized text can reuse the extracted fields
+# instead of paying another Gemini round-trip
+_EXTRACTION_CACHE = {}
+_EXTRACTION_CACHE_TTL = 86400  # seconds
+
+def _extraction_cache_key(text_content: str) -> str:
+    normalized = ' '.join(text_content.split()).lower()
+    return hashlib.sha1(normalized.encode()).hexdigest()
+
+def get_cached_extraction(text_content: str):
+    """Return cached AI fields for this listing text, or None"""
+    entry = _EXTRACTION_CACHE.get(_extraction_cache_key(text_content))
+    if entry and time.monotonic() - entry[0] < _EXTRACTION_CACHE_TTL:
+        return entry[1]
+    return None
+
+def cache_extraction(text_content: str, ai_data: dict):
+    """Remember the extracted fields for identical listing texts"""
+    _EXTRACTION_CACHE[_extraction_cache_key(text_content)] = (time.monotonic(), ai_data)
+
+# Matches the first JSON object in an AI response, fences and all ignored
+_JSON_OBJ_RE = re.compile(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', re.S)
+
+@lru_cache(maxsize=128)
+def parse_ai_response(response_text: str) -> dict:
+    """Parse the first JSON object out of an AI response (memoized -
+    identical prompts frequently yield byte-identical responses)"""
+    match = _JSON_OBJ_RE.search(response_text)
+    return orjson.loads(match.group(0)) if match else {}
+
+# Sahibinden's classifiedInfoList labels mapped onto PropertyListing fields
+_INFO_LABEL_FIELDS = {
+    'Oda Sayısı': 'room_count',
+    'm² (Net)': 'net_area',
+    'Isıtma': 'heating_type',
+    'Otopark': 'parking_type',
+    'Site İçerisinde': 'is_in_complex',
+    'Site Adı': 'complex_name',
+    'Krediye Uygun': 'credit_suitable',
+    'Fiyat': 'price',
+}
+
+def extract_fields_local(html: str) -> dict:
+    """Resolve fields from the classifiedInfoList DOM table without the LLM"""
+    fields = {}
+    if not html:
+        return fields
+    try:
+        tree = lxml.html.fromstring(html)
+    except Exception:
+        return fields
+    for item in tree.xpath("//ul[contains(@class, 'classifiedInfoList')]/li"):
+        labels = item.xpath('./strong')
+        values = item.xpath('./span')
+        if not labels or not values:
+            continue
+        field = _INFO_LABEL_FIELDS.get(labels[0].text_content().strip())
+        if field:
+            fields[field] = values[0].text_content().strip()
+    return fields
+
+# Precompiled extractors for the highly regular Turkish listing patterns
+_PHONE_RE = re.compile(r'0\d{3}\s?\d{3}\s?\d{2}\s?\d{2}')
+_ROOM_RE = re.compile(r'\b(\d\+\d)\b')
+_AREA_RE = re.compile(r'(\d{2,4})\s*m²')
+_PRICE_RE = re.compile(r'([\d.]+)\s*TL')
+_COMPLEX_RE = re.compile(r'Site\s*[İiI]çi[^:]*:\s*(Evet|Hayır)', re.I)
+
+# Fields the AI fallback is still worth a round-trip for
+_CRITICAL_FIELDS = ('contact_number', 'room_count', 'net_area', 'price')
+
+def extract_fields_fast(listing: PropertyListing, text_content: str):
+    """Fill listing fields that match the precompiled patterns, without an LLM call"""
+    if not listing.contact_number:
+        match = _PHONE_RE.search(text_content)
+        if match:
+            listing.contact_number = match.group(0)
+    if not listing.room_count:
+        match = _ROOM_RE.search(text_content)
+        if match:
+            listing.room_count = match.group(1)
+    if not listing.net_area:
+        match = _AREA_RE.search(text_content)
+        if match:
+            listing.net_area = f"{match.group(1)} m²"
+    if not listing.price:
+        match = _PRICE_RE.search(text_content)
+        if match:
+            listing.price = f"{match.group(1)} TL"
+    if not listing.is_in_complex:
+        match = _COMPLEX_RE.search(text_content)
+        if match:
+            listing.is_in_complex = match.group(1)
+
+def fill_default_fields(listing: PropertyListing):
+    """Set default values for fields that are still empty"""
+    if not listing.owner_name:
+        listing.owner_name = "HTML Parse Gerekli"
+    if not listing.contact_number:
+        listing.contact_number = "Detay Sayfasında"
+    if not listing.room_count:
+        listing.room_count = "Belirtilmemiş"
+    if not listing.net_area:
+        listing.net_area = "Belirtilmemiş"
+    if not listing.is_in_complex:
+        listing.is_in_complex = "Belirtilmemiş"
+    if not listing.heating_type:
+        listing.heating_type = "Belirtilmemiş"
+    if not listing.parking_type:
+        listing.parking_type = "Belirtilmemiş"
+    if not listing.credit_suitable:
+        listing.credit_suitable = "Belirtilmemiş"
+    if not listing.price:
+        listing.price = "Belirtilmemiş"
+
+# Field -> default used when neither local extraction nor the AI found a value
+_AI_FIELD_DEFAULTS = {
+    'owner_name': 'Tespit Edilemedi',
+    'contact_number': 'Tespit Edilemedi',
+    'room_count': 'Belirtilmemiş',
+    'net_area': 'Belirtilmemiş',
+    'is_in_complex': 'Belirtilmemiş',
+    'complex_name': '',
+    'heating_type': 'Belirtilmemiş',
+    'parking_type': 'Belirtilmemiş',
+    'credit_suitable': 'Belirtilmemiş',
+    'price': 'Belirtilmemiş',
+}
+
+def apply_ai_fields(listing: PropertyListing, ai_data: dict):
+    """Merge AI-extracted values into the listing. The AI returns "" for
+    unknown fields, so empty values must not clobber locally extracted ones;
+    fields neither side resolved get the defaults"""
+    for field, default in _AI_FIELD_DEFAULTS.items():
+        value = ai_data.get(field)
+        if value:
+            setattr(listing, field, value)
+        elif default and not getattr(listing, field):
+            setattr(listing, field, default)
+
+async def extract_listings_batch_with_ai(batch: List[PropertyListing]):
+    """Extract fields for a whole batch of listings with a single Gemini call"""
+    sections = []
+    for index, listing in enumerate(batch):
+        text_content = listing.text_snippet or html_to_text(listing.raw_html)
+        sections.append(f"### İlan {index + 1}\n{text_content}")
+    listings_text = "\n\n".join(sections)
+
+    prompt = f"""
+    Aşağıdaki {len(batch)} emlak ilanının her biri için şu alanları çıkart:
+    owner_name, contact_number, room_count, net_area, is_in_complex,
+    complex_name, heating_type, parking_type, credit_suitable, price
+
+    Yanıtını ilanlarla aynı sırada {len(batch)} nesnelik bir JSON dizisi olarak ver.
+    Bilgi bulunamazsa boş string ("") kullan.
+
+    {listings_text}
+    """
+
+    user_message = UserMessage(text=prompt)
+    chat = await acquire_chat()
+    try:
+        response_text = (await chat.send_message(user_message)).strip()
+    finally:
+        release_chat(chat)
+
+    # Extract the JSON array from the response
+    json_start = response_text.find('[')
+    json_end = response_text.rfind(']') + 1
+    ai_items = orjson.loads(response_text[json_start:json_end])
+
+    for listing, ai_data in zip(batch, ai_items):
+        # Empty items get another chance in the per-listing phase
+        if ai_data:
+            apply_ai_fields(listing, ai_data)
+
+async def process_listings_batch(listings: List[PropertyListing], k: int = 8,
+                                 progress_cb=None) -> List[PropertyListing]:
+    """Process listings with AI in batches of k to amortize per-call overhead"""
+    # Listings that already carry data (e.g. demo) don't need AI at all
+    pending = [listing for listing in listings if not (listing.owner_name and listing.price)]
+    if GEMINI_API_KEY and pending:
+        batches = [pending[start:start + k] for start in range(0, len(pending), k)]
+        done = 0
+        # Report progress once per finished batch, not once per listing
+        for batch_task in asyncio.as_completed(
+                [extract_listings_batch_with_ai(batch) for batch in batches]):
+            try:
+                await batch_task
+            except Exception as e:
+                logging.error(f"Batch AI extraction failed: {e}")
+            done += 1
+            if progress_cb is not None:
+                await progress_cb(min(done * k, len(pending)))
+
+    # Per-listing pass fills whatever is still missing (bounded to avoid API pressure)
+    semaphore = asyncio.Semaphore(8)
+
+    async def process_bounded(listing: PropertyListing) -> PropertyListing:
+        async with semaphore:
+            return await process_listing_with_ai(listing)
+
+    return list(await asyncio.gather(
+        *[process_bounded(listing) for listing in listings]
+    ))
+
+async def process_listing_with_ai(listing: PropertyListing, chat: Optional[LlmChat] = None) -> PropertyListing:
     """Process a single listing using Gemini AI or fallback to HTML parsing - SIMPLIFIED"""
     try:
         # If listing already has data (from demo), return as is
@@ -315,66 +674,61 @@ async def process_listing_with_ai(listing: PropertyListing) -> PropertyListing:
         # Check if Gemini API is available
         if GEMINI_API_KEY:
             try:
-                # Initialize Gemini chat
-                chat = await init_gemini_chat()
-                
-                # Parse HTML content with BeautifulSoup
-                soup = BeautifulSoup(listing.raw_html, 'html.parser')
-                
-                # Extract text content
-                text_content = soup.get_text()[:2000]  # Reduced limit
-                
-                # Create simple prompt for AI
+                # Use the text parsed at scrape time, re-parsing only if absent
+                text_content = listing.text_snippet or html_to_text(listing.raw_html)
+
+                # Structured DOM table first, then the regex fast path - only
+                # fall through to the LLM when two or more critical fields are
+                # still unresolved
+                for field, value in extract_fields_local(listing.raw_html).items():
+                    if value and not getattr(listing, field):
+                        setattr(listing, field, value)
+                extract_fields_fast(listing, text_content)
+                missing = [field for field in _CRITICAL_FIELDS if not getattr(listing, field)]
+                if len(missing) < 2:
+                    fill_default_fields(listing)
+                    return listing
+
+                # A previously extracted identical listing text skips the LLM too
+                cached = get_cached_extraction(text_content)
+                if cached is not None:
+                    apply_ai_fields(listing, cached)
+                    return listing
+
+                # Borrow a pooled chat session unless the caller provided one
+                pooled_chat = None
+                if chat is None:
+                    pooled_chat = await acquire_chat()
+                    chat = pooled_chat
+
+                # The system prompt already defines the 10 fields - repeating a
+                # JSON template here only burns input tokens
                 prompt = f"""
-                Bu emlak ilanından aşağıdaki bilgileri çıkart ve sadece JSON formatında ver:
-                
+                Bu emlak ilanından sistem mesajında tanımlanan 10 alanı çıkart.
+                Yanıt olarak yalnızca JSON nesnesini döndür; markdown veya açıklama ekleme.
+
                 {text_content}
-                
-                {{
-                    "owner_name": "İlan sahibinin adı",
-                    "contact_number": "Telefon numarası",
-                    "room_count": "Oda sayısı (örn: 3+1)",
-                    "net_area": "Metrekare",
-                    "is_in_complex": "Site içinde mi? (Evet/Hayır)",
-                    "complex_name": "Site adı (varsa)",
-                    "heating_type": "Isıtma türü",
-                    "parking_type": "Otopark (Kapalı/Açık/Yok)",
-                    "credit_suitable": "Krediye uygun (Evet/Hayır)",
-                    "price": "Fiyat"
-                }}
                 """
                 
                 user_message = UserMessage(text=prompt)
-                response = await chat.send_message(user_message)
-                
+                try:
+                    response = await chat.send_message(user_message)
+                finally:
+                    if pooled_chat is not None:
+                        release_chat(pooled_chat)
+
                 # Parse AI response
                 try:
-                    # Extract JSON from response
-                    response_text = response.strip()
-                    if '```json' in response_text:
-                        json_start = response_text.find('{')
-                        json_end = response_text.rfind('}') + 1
-                        json_text = response_text[json_start:json_end]
-                    else:
-                        json_text = response_text
-                        
-                    ai_data = json.loads(json_text)
-                    
-                    # Update listing with AI extracted data
-                    listing.owner_name = ai_data.get('owner_name', 'Tespit Edilemedi')
-                    listing.contact_number = ai_data.get('contact_number', 'Tespit Edilemedi')
-                    listing.room_count = ai_data.get('room_count', 'Belirtilmemiş')
-                    listing.net_area = ai_data.get('net_area', 'Belirtilmemiş')
-                    listing.is_in_complex = ai_data.get('is_in_complex', 'Belirtilmemiş')
-                    listing.complex_name = ai_data.get('complex_name', '')
-                    listing.heating_type = ai_data.get('heating_type', 'Belirtilmemiş')
-                    listing.parking_type = ai_data.get('parking_type', 'Belirtilmemiş')
-                    listing.credit_suitable = ai_data.get('credit_suitable', 'Belirtilmemiş')
-                    listing.price = ai_data.get('price', 'Belirtilmemiş')
-                    
-                    return listing
-                    
-                except json.JSONDecodeError as e:
+                    # Extract the JSON object from the response in one scan
+                    ai_data = parse_ai_response(response.strip())
+                    if ai_data:
+                        cache_extraction(text_content, ai_data)
+                        # Merge AI values over what local extraction found
+                        apply_ai_fields(listing, ai_data)
+                        return listing
+                    # Unparseable/empty response - use the regex fallback below
+
+                except orjson.JSONDecodeError as e:
                     logging.error(f"JSON parse error: {e}")
                     # Fall back to HTML parsing
                     
@@ -382,30 +736,10 @@ async def process_listing_with_ai(listing: PropertyListing) -> PropertyListing:
                 logging.error(f"Error processing listing with AI: {e}")
                 # Fall back to HTML parsing
         
-        # Fallback: Simple HTML parsing
-        if not listing.owner_name or not listing.price:
-            soup = BeautifulSoup(listing.raw_html, 'html.parser')
-            text_content = soup.get_text()
-            
-            # Set default values if still empty
-            if not listing.owner_name:
-                listing.owner_name = "HTML Parse Gerekli"
-            if not listing.contact_number:
-                listing.contact_number = "Detay Sayfasında"
-            if not listing.room_count:
-                listing.room_count = "Belirtilmemiş"
-            if not listing.net_area:
-                listing.net_area = "Belirtilmemiş"
-            if not listing.is_in_complex:
-                listing.is_in_complex = "Belirtilmemiş"
-            if not listing.heating_type:
-                listing.heating_type = "Belirtilmemiş"
-            if not listing.parking_type:
-                listing.parking_type = "Belirtilmemiş"
-            if not listing.credit_suitable:
-                listing.credit_suitable = "Belirtilmemiş"
-            if not listing.price:
-                listing.price = "Belirtilmemiş"
+        # Fallback: regex extraction over the raw text, then defaults
+        # (both helpers only touch fields that are still empty)
+        extract_fields_fast(listing, listing.text_snippet or html_to_text(listing.raw_html))
+        fill_default_fields(listing)
     
     except Exception as e:
         logging.error(f"Error processing listing: {e}")
@@ -431,11 +765,11 @@ async def start_scraping(request: ScrapingRequest, background_tasks: BackgroundT
         year=request.year,
         total_listings=0,
         processed_listings=0,
-        status="processing"
+        status="scraping"
     )
-    
+
     # Save initial result to database
-    await db.scraping_results.insert_one(result.dict())
+    await db.scraping_results.insert_one(result.model_dump())
     
     # Start background scraping task
     background_tasks.add_task(perform_scraping, result.id, request)
@@ -445,12 +779,8 @@ async def start_scraping(request: ScrapingRequest, background_tasks: BackgroundT
 async def perform_scraping(result_id: str, request: ScrapingRequest):
     """Background task to perform the actual scraping"""
     try:
-        # Update status
-        await db.scraping_results.update_one(
-            {"id": result_id},
-            {"$set": {"status": "scraping"}}
-        )
-        
+        # Status is already "scraping" from the kickoff insert - go straight
+        # to fetching instead of spending a round-trip on a status flip
         # Scrape listings
         listings = await scrape_sahibinden_listings(request.url, request.month, request.year)
         
@@ -460,23 +790,34 @@ async def perform_scraping(result_id: str, request: ScrapingRequest):
             {"$set": {"total_listings": len(listings), "status": "processing_ai"}}
         )
         
-        # Process each listing with AI
-        processed_listings = []
-        for listing in listings:
-            processed_listing = await process_listing_with_ai(listing)
-            processed_listings.append(processed_listing)
-            
-            # Update progress
+        # Process listings with AI in batches, with throttled progress writes:
+        # at most one counter update every couple of seconds
+        last_progress_write = 0.0
+
+        async def update_progress(count: int):
+            nonlocal last_progress_write
+            now = time.monotonic()
+            if now - last_progress_write < 2:
+                return
+            last_progress_write = now
             await db.scraping_results.update_one(
                 {"id": result_id},
-                {"$set": {"processed_listings": len(processed_listings)}}
+                {"$set": {"processed_listings": count}}
             )
-        
-        # Save final results
+
+        processed_listings = await process_listings_batch(listings, progress_cb=update_progress)
+
+        # The HTML is dead weight once extraction is done - keep it out of
+        # Mongo so documents and result payloads stay small
+        for listing in processed_listings:
+            listing.raw_html = ""
+
+        # Save final results in a single write (listings, count and status)
         await db.scraping_results.update_one(
             {"id": result_id},
             {"$set": {
-                "listings": [listing.dict() for listing in processed_listings],
+                "listings": [listing.model_dump() for listing in processed_listings],
+                "processed_listings": len(processed_listings),
                 "status": "completed"
             }}
         )
@@ -494,13 +835,22 @@ async def get_scraping_result(result_id: str):
     result = await db.scraping_results.find_one({"id": result_id})
     if not result:
         raise HTTPException(status_code=404, detail="Result not found")
-    return ScrapingResult(**result)
+    return ScrapingResult.model_validate(result)
+
+@api_router.get("/results", response_model=None)
+async def get_all_results(skip: int = 0, limit: int = 50) -> List[dict]:
+    """Get scraping result summaries (listings are fetched via /results/{id})"""
+    # Trusted read of our own documents - echo the projection back without
+    # re-running Pydantic validation per record
+    cursor = db.scraping_results.find({}, projection={"_id": 0, "listings": 0}) \
+        .sort("created_date", -1).skip(skip).limit(limit)
+    return await cursor.to_list(limit)
 
-@api_router.get("/results", response_model=List[ScrapingResult])
-async def get_all_results():
-    """Get all scraping results"""
-    results = await db.scraping_results.find().sort("created_date", -1).to_list(50)
-    return [ScrapingResult(**result) for result in results]
+# Export column layout - header labels and the listing fields they map to
+EXCEL_COLUMNS = ('İlan Sahibi', 'Telefon', 'Oda Sayısı', 'Net m²', 'Site İçi',
+                 'Site Adı', 'Isıtma', 'Otopark', 'Krediye Uygun', 'Fiyat')
+FIELD_ORDER = ('owner_name', 'contact_number', 'room_count', 'net_area', 'is_in_complex',
+               'complex_name', 'heating_type', 'parking_type', 'credit_suitable', 'price')
 
 @api_router.get("/export/excel/{result_id}")
 async def export_excel(result_id: str):
@@ -509,33 +859,28 @@ async def export_excel(result_id: str):
     if not result:
         raise HTTPException(status_code=404, detail="Result not found")
     
-    # Convert to DataFrame
-    data = []
-    for listing in result.get('listings', []):
-        data.append({
-            'İlan Sahibi': listing.get('owner_name', ''),
-            'Telefon': listing.get('contact_number', ''),
-            'Oda Sayısı': listing.get('room_count', ''),
-            'Net m²': listing.get('net_area', ''),
-            'Site İçi': listing.get('is_in_complex', ''),
-            'Site Adı': listing.get('complex_name', ''),
-            'Isıtma': listing.get('heating_type', ''),
-            'Otopark': listing.get('parking_type', ''),
-            'Krediye Uygun': listing.get('credit_suitable', ''),
-            'Fiyat': listing.get('price', '')
-        })
-    
-    df = pd.DataFrame(data)
-    
-    # Save to file
+    # Tuples of values avoid building a throwaway dict per listing
+    rows = [tuple(listing.get(field, '') for field in FIELD_ORDER)
+            for listing in result.get('listings', [])]
+    df = pd.DataFrame.from_records(rows, columns=EXCEL_COLUMNS)
+
+    # Build the workbook in memory and stream it to the client
     filename = f"emlak_listesi_{result_id}.xlsx"
-    filepath = f"/tmp/{filename}"
-    df.to_excel(filepath, index=False)
-    
-    return FileResponse(
-        path=filepath,
-        filename=filename,
-        media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    buf = io.BytesIO()
+
+    # constant_memory flushes each row as it is written, keeping RAM flat on big exports
+    def write_workbook():
+        with pd.ExcelWriter(buf, engine='xlsxwriter', engine_kwargs={'options': {'constant_memory': True}}) as writer:
+            df.to_excel(writer, index=False, sheet_name='Listings')
+
+    # Workbook generation is sync CPU work - keep it off the event loop
+    await asyncio.to_thread(write_workbook)
+    buf.seek(0)
+
+    return StreamingResponse(
+        buf,
+        media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
     )
 
 @api_router.get("/export/pdf/{result_id}")
@@ -545,11 +890,11 @@ async def export_pdf(result_id: str):
     if not result:
         raise HTTPException(status_code=404, detail="Result not found")
     
-    # Create PDF
+    # Create PDF in memory
     filename = f"emlak_listesi_{result_id}.pdf"
-    filepath = f"/tmp/{filename}"
-    
-    doc = SimpleDocTemplate(filepath, pagesize=A4)
+    buf = io.BytesIO()
+
+    doc = SimpleDocTemplate(buf, pagesize=A4)
     styles = getSampleStyleSheet()
     
     # Build content
@@ -581,9 +926,8 @@ async def export_pdf(result_id: str):
         ]
         table_data.append(row)
     
-    # Create table
-    table = Table(table_data)
-    table.setStyle(TableStyle([
+    # Shared table style and explicit column widths (skips per-column auto-sizing)
+    table_style = TableStyle([
         ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
         ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
         ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
@@ -593,15 +937,29 @@ async def export_pdf(result_id: str):
         ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
         ('FONTSIZE', (0, 1), (-1, -1), 6),
         ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    
-    content.append(table)
-    doc.build(content)
-    
-    return FileResponse(
-        path=filepath,
-        filename=filename,
-        media_type='application/pdf'
+    ])
+    col_widths = [50, 50, 40, 35, 35, 45, 45, 40, 45, 50]
+
+    # Emit the grid in small chunks; ReportLab's page splitting gets very slow
+    # when it has to break one huge table across many pages
+    chunk_size = 50
+    body_rows = table_data[1:]
+    for start in range(0, max(len(body_rows), 1), chunk_size):
+        table = LongTable([headers] + body_rows[start:start + chunk_size],
+                          colWidths=col_widths, repeatRows=1)
+        table.setStyle(table_style)
+        content.append(table)
+        if start + chunk_size < len(body_rows):
+            content.append(PageBreak())
+
+    # PDF layout is sync CPU work - keep it off the event loop
+    await asyncio.to_thread(doc.build, content)
+    buf.seek(0)
+
+    return StreamingResponse(
+        buf,
+        media_type='application/pdf',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
     )
 
 # Test endpoint for Gemini
@@ -637,6 +995,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Result payloads are highly repetitive JSON - gzip cuts them 5-10x
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=6)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -644,6 +1005,36 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def warm_browser():
+    # Pay the Chromium cold start at boot instead of on the first scrape
+    try:
+        await get_browser()
+    except Exception as e:
+        logging.error(f"Browser warm-up failed: {e}")
+
+@app.on_event("startup")
+async def warm_chat_pool():
+    if GEMINI_API_KEY:
+        await fill_chat_pool()
+
+@app.on_event("startup")
+async def create_db_indexes():
+    # Every endpoint looks results up by id, and the list endpoint sorts by
+    # created_date - without these indexes both are collection scans
+    await db.scraping_results.create_index("id", unique=True)
+    await db.scraping_results.create_index([("created_date", -1)])
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    await client.close()
+
+@app.on_event("shutdown")
+async def shutdown_browser():
+    global _playwright, _browser
+    if _browser is not None:
+        await _browser.close()
+        _browser = None
+    if _playwright is not None:
+        await _playwright.stop()
+        _playwright = None
\ No newline at end of file
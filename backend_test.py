@@ -4,9 +4,9 @@ Backend API Test Suite for Sahibinden.com Real Estate Scraper
 Tests all backend endpoints and functionality
 """
 
-import requests
+import asyncio
+import httpx
 import json
-import time
 import os
 from datetime import datetime
 
@@ -31,13 +31,23 @@ print(f"Testing backend API at: {API_URL}")
 
 class BackendTester:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'User-Agent': 'Backend-Test-Suite/1.0'
-        })
+        self.client = httpx.AsyncClient(
+            base_url=API_URL,
+            headers={
+                'Content-Type': 'application/json',
+                'User-Agent': 'Backend-Test-Suite/1.0'
+            },
+            timeout=10.0
+        )
+        # Bound concurrent requests so the dev server isn't overwhelmed
+        self.semaphore = asyncio.Semaphore(8)
         self.test_results = []
-        
+
+    async def request(self, method, url, **kwargs):
+        """Issue a request under the concurrency bound"""
+        async with self.semaphore:
+            return await self.client.request(method, url, **kwargs)
+
     def log_test(self, test_name, success, message, details=None):
         """Log test results"""
         result = {
@@ -52,11 +62,11 @@ class BackendTester:
         print(f"{status} - {test_name}: {message}")
         if details and not success:
             print(f"   Details: {details}")
-    
-    def test_root_endpoint(self):
+
+    async def test_root_endpoint(self):
         """Test 1: Basic API connection - test the root endpoint /api/"""
         try:
-            response = self.session.get(f"{API_URL}/")
+            response = await self.request('GET', '/')
             if response.status_code == 200:
                 data = response.json()
                 if "message" in data and "Sahibinden" in data["message"]:
@@ -71,11 +81,11 @@ class BackendTester:
         except Exception as e:
             self.log_test("Root Endpoint", False, f"Connection error: {str(e)}")
             return False
-    
-    def test_gemini_api(self):
+
+    async def test_gemini_api(self):
         """Test 2: Test Gemini API integration - should show api_disabled status"""
         try:
-            response = self.session.post(f"{API_URL}/test-gemini")
+            response = await self.request('POST', '/test-gemini')
             if response.status_code == 200:
                 data = response.json()
                 if data.get("status") == "success":
@@ -93,8 +103,8 @@ class BackendTester:
         except Exception as e:
             self.log_test("Gemini API", False, f"Request error: {str(e)}")
             return False
-    
-    def test_scraping_endpoint(self):
+
+    async def test_scraping_endpoint(self):
         """Test 3: Test scraping endpoint with specific parameters from user request"""
         try:
             scraping_data = {
@@ -102,11 +112,11 @@ class BackendTester:
                 "month": 8,
                 "year": 2025
             }
-            
-            response = self.session.post(f"{API_URL}/scrape", json=scraping_data)
+
+            response = await self.request('POST', '/scrape', json=scraping_data)
             if response.status_code == 200:
                 data = response.json()
-                if "id" in data and data.get("status") == "processing":
+                if "id" in data and data.get("status") in ("processing", "scraping"):
                     self.log_test("Scraping Endpoint", True, f"Scraping started successfully, ID: {data['id']}")
                     return data["id"]  # Return the result ID for further testing
                 else:
@@ -118,46 +128,46 @@ class BackendTester:
         except Exception as e:
             self.log_test("Scraping Endpoint", False, f"Request error: {str(e)}")
             return None
-    
-    def test_results_endpoint(self, result_id):
+
+    async def test_results_endpoint(self, result_id):
         """Test 4: Check if scraping result can be retrieved and verify listing data"""
         if not result_id:
             self.log_test("Results Endpoint", False, "No result ID to test with")
             return None
-            
+
         try:
             # Wait for processing to complete (up to 30 seconds)
             max_wait = 30
             wait_time = 0
-            
+
             while wait_time < max_wait:
-                time.sleep(2)
+                await asyncio.sleep(2)
                 wait_time += 2
-                
-                response = self.session.get(f"{API_URL}/results/{result_id}")
+
+                response = await self.request('GET', f'/results/{result_id}')
                 if response.status_code == 200:
                     data = response.json()
                     if "id" in data and data["id"] == result_id:
                         status = data.get("status", "unknown")
-                        
+
                         if status == "completed":
                             # Verify listing data format
                             listings = data.get("listings", [])
                             if listings:
                                 sample_listing = listings[0]
-                                required_fields = ['owner_name', 'contact_number', 'room_count', 'net_area', 
-                                                 'is_in_complex', 'heating_type', 'parking_type', 
+                                required_fields = ['owner_name', 'contact_number', 'room_count', 'net_area',
+                                                 'is_in_complex', 'heating_type', 'parking_type',
                                                  'credit_suitable', 'price']
-                                
+
                                 missing_fields = []
                                 empty_fields = []
-                                
+
                                 for field in required_fields:
                                     if field not in sample_listing:
                                         missing_fields.append(field)
                                     elif not sample_listing[field] or sample_listing[field].strip() == "":
                                         empty_fields.append(field)
-                                
+
                                 if missing_fields:
                                     self.log_test("Results Endpoint", False, f"Missing fields in listing: {missing_fields}")
                                     return data
@@ -188,19 +198,19 @@ class BackendTester:
                 else:
                     self.log_test("Results Endpoint", False, f"HTTP {response.status_code}", response.text)
                     return None
-            
+
             # Timeout reached
             self.log_test("Results Endpoint", False, f"Processing timeout after {max_wait} seconds")
             return None
-            
+
         except Exception as e:
             self.log_test("Results Endpoint", False, f"Request error: {str(e)}")
             return None
-    
-    def test_all_results_endpoint(self):
+
+    async def test_all_results_endpoint(self):
         """Test 5: Get all results endpoint"""
         try:
-            response = self.session.get(f"{API_URL}/results")
+            response = await self.request('GET', '/results')
             if response.status_code == 200:
                 data = response.json()
                 if isinstance(data, list):
@@ -215,15 +225,15 @@ class BackendTester:
         except Exception as e:
             self.log_test("All Results Endpoint", False, f"Request error: {str(e)}")
             return False
-    
-    def test_excel_export(self, result_id):
+
+    async def test_excel_export(self, result_id):
         """Test 6: Test Excel export endpoint"""
         if not result_id:
             self.log_test("Excel Export", False, "No result ID to test with")
             return False
-            
+
         try:
-            response = self.session.get(f"{API_URL}/export/excel/{result_id}")
+            response = await self.request('GET', f'/export/excel/{result_id}')
             if response.status_code == 200:
                 content_type = response.headers.get('content-type', '')
                 if 'spreadsheet' in content_type or 'excel' in content_type:
@@ -241,15 +251,15 @@ class BackendTester:
         except Exception as e:
             self.log_test("Excel Export", False, f"Request error: {str(e)}")
             return False
-    
-    def test_pdf_export(self, result_id):
+
+    async def test_pdf_export(self, result_id):
         """Test 7: Test PDF export endpoint"""
         if not result_id:
             self.log_test("PDF Export", False, "No result ID to test with")
             return False
-            
+
         try:
-            response = self.session.get(f"{API_URL}/export/pdf/{result_id}")
+            response = await self.request('GET', f'/export/pdf/{result_id}')
             if response.status_code == 200:
                 content_type = response.headers.get('content-type', '')
                 if 'pdf' in content_type:
@@ -267,17 +277,17 @@ class BackendTester:
         except Exception as e:
             self.log_test("PDF Export", False, f"Request error: {str(e)}")
             return False
-    
+
     def display_listing_data(self, result_data):
         """Display actual listing data for verification"""
         if not result_data or not result_data.get("listings"):
             print("\n📋 No listing data to display")
             return
-            
+
         listings = result_data.get("listings", [])
         print(f"\n📋 LISTING DATA VERIFICATION ({len(listings)} listings found)")
         print("=" * 80)
-        
+
         for i, listing in enumerate(listings[:3], 1):  # Show first 3 listings
             print(f"\n🏠 Listing {i}:")
             print(f"   İlan Sahibi: {listing.get('owner_name', 'N/A')}")
@@ -291,17 +301,17 @@ class BackendTester:
             print(f"   Krediye Uygun: {listing.get('credit_suitable', 'N/A')}")
             print(f"   Fiyat: {listing.get('price', 'N/A')}")
             print(f"   İlan Tarihi: {listing.get('listing_date', 'N/A')}")
-        
+
         if len(listings) > 3:
             print(f"\n   ... and {len(listings) - 3} more listings")
-        
+
         print("=" * 80)
-    
-    def test_error_handling(self):
+
+    async def test_error_handling(self):
         """Test 8: Test error handling"""
         try:
             # Test invalid result ID
-            response = self.session.get(f"{API_URL}/results/invalid-id")
+            response = await self.request('GET', '/results/invalid-id')
             if response.status_code == 404:
                 self.log_test("Error Handling", True, "404 error handling works correctly")
                 return True
@@ -311,62 +321,60 @@ class BackendTester:
         except Exception as e:
             self.log_test("Error Handling", False, f"Request error: {str(e)}")
             return False
-    
-    def run_all_tests(self):
+
+    async def run_all_tests(self):
         """Run all backend tests"""
         print("=" * 60)
         print("STARTING BACKEND API TESTS")
         print("=" * 60)
-        
-        # Test 1: Basic API connection
-        root_success = self.test_root_endpoint()
-        
-        # Test 2: Gemini API integration
-        gemini_success = self.test_gemini_api()
-        
-        # Test 3: Scraping endpoint
-        result_id = self.test_scraping_endpoint()
-        
+
+        # Independent endpoint tests run concurrently (Tests 1, 2, 5, 8)
+        await asyncio.gather(
+            self.test_root_endpoint(),
+            self.test_gemini_api(),
+            self.test_all_results_endpoint(),
+            self.test_error_handling()
+        )
+
+        # Test 3: Scraping endpoint (the rest depend on its result ID)
+        result_id = await self.test_scraping_endpoint()
+
         # Test 4: Results endpoint
-        result_data = self.test_results_endpoint(result_id)
-        
+        result_data = await self.test_results_endpoint(result_id)
+
         # Display listing data for verification
         if result_data:
             self.display_listing_data(result_data)
-        
-        # Test 5: All results endpoint
-        all_results_success = self.test_all_results_endpoint()
-        
+
         # Test 6 & 7: Export endpoints (only if we have a result ID)
-        excel_success = self.test_excel_export(result_id)
-        pdf_success = self.test_pdf_export(result_id)
-        
-        # Test 8: Error handling
-        error_handling_success = self.test_error_handling()
-        
+        await asyncio.gather(
+            self.test_excel_export(result_id),
+            self.test_pdf_export(result_id)
+        )
+
         # Summary
         print("\n" + "=" * 60)
         print("TEST SUMMARY")
         print("=" * 60)
-        
+
         passed = sum(1 for result in self.test_results if result['success'])
         total = len(self.test_results)
-        
+
         print(f"Tests Passed: {passed}/{total}")
         print(f"Success Rate: {(passed/total)*100:.1f}%")
-        
+
         # Critical issues
         critical_failures = []
         for result in self.test_results:
             if not result['success']:
                 if result['test'] in ['Root Endpoint', 'Gemini API', 'Scraping Endpoint']:
                     critical_failures.append(result['test'])
-        
+
         if critical_failures:
             print(f"\n❌ CRITICAL FAILURES: {', '.join(critical_failures)}")
         else:
             print(f"\n✅ All critical endpoints working")
-        
+
         return {
             'total_tests': total,
             'passed_tests': passed,
@@ -375,6 +383,12 @@ class BackendTester:
             'test_results': self.test_results
         }
 
-if __name__ == "__main__":
+async def main():
     tester = BackendTester()
-    results = tester.run_all_tests()
\ No newline at end of file
+    try:
+        return await tester.run_all_tests()
+    finally:
+        await tester.client.aclose()
+
+if __name__ == "__main__":
+    results = asyncio.run(main())
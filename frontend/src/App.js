@@ -13,6 +13,7 @@ function App() {
   const [currentResult, setCurrentResult] = useState(null);
   const [loading, setLoading] = useState(false);
   const [testStatus, setTestStatus] = useState(null);
+  const [previews, setPreviews] = useState({});
 
   const months = [
     { value: 1, label: 'Ocak' },
@@ -103,6 +104,25 @@ function App() {
     }
   };
 
+  // The results list comes without listings - fetch them per result on demand
+  const togglePreview = async (resultId) => {
+    if (previews[resultId]) {
+      setPreviews(prev => {
+        const next = { ...prev };
+        delete next[resultId];
+        return next;
+      });
+      return;
+    }
+    try {
+      const response = await axios.get(`${API}/results/${resultId}`);
+      setPreviews(prev => ({ ...prev, [resultId]: response.data.listings || [] }));
+    } catch (error) {
+      console.error('Preview load error:', error);
+      alert('Önizleme yüklenemedi!');
+    }
+  };
+
   const downloadExcel = async (resultId) => {
     try {
       const response = await axios.get(`${API}/export/excel/${resultId}`, {
@@ -317,7 +337,7 @@ function App() {
                         <div className="text-xs text-gray-500">İşlenen</div>
                       </div>
                       <div className="text-center">
-                        <div className="text-2xl font-bold text-purple-600">{result.listings?.length || 0}</div>
+                        <div className="text-2xl font-bold text-purple-600">{result.processed_listings}</div>
                         <div className="text-xs text-gray-500">Başarılı</div>
                       </div>
                       <div className="text-center">
@@ -328,7 +348,7 @@ function App() {
                       </div>
                     </div>
 
-                    {result.status === 'completed' && result.listings?.length > 0 && (
+                    {result.status === 'completed' && result.processed_listings > 0 && (
                       <>
                         <div className="flex space-x-4 mb-4">
                           <button
@@ -345,8 +365,16 @@ function App() {
                             <FileText className="w-4 h-4" />
                             <span>PDF İndir</span>
                           </button>
+                          <button
+                            onClick={() => togglePreview(result.id)}
+                            className="flex items-center space-x-2 bg-blue-600 hover:bg-blue-700 text-white px-4 py-2 rounded-lg transition-all transform hover:scale-105"
+                          >
+                            <Users className="w-4 h-4" />
+                            <span>{previews[result.id] ? 'Önizlemeyi Gizle' : 'Önizleme'}</span>
+                          </button>
                         </div>
 
+                        {previews[result.id] && (
                         <div className="overflow-x-auto">
                           <table className="w-full text-sm">
                             <thead>
@@ -363,7 +391,7 @@ function App() {
                               </tr>
                             </thead>
                             <tbody>
-                              {result.listings.slice(0, 5).map((listing, i) => (
+                              {previews[result.id].slice(0, 5).map((listing, i) => (
                                 <tr key={i} className="border-t">
                                   <td className="px-4 py-2">{listing.owner_name || '-'}</td>
                                   <td className="px-4 py-2">{listing.contact_number || '-'}</td>
@@ -383,12 +411,13 @@ function App() {
                               ))}
                             </tbody>
                           </table>
-                          {result.listings.length > 5 && (
+                          {previews[result.id].length > 5 && (
                             <p className="text-center text-gray-500 py-4">
-                              ... ve {result.listings.length - 5} ilan daha (Excel/PDF'de tüm liste)
+                              ... ve {previews[result.id].length - 5} ilan daha (Excel/PDF'de tüm liste)
                             </p>
                           )}
                         </div>
+                        )}
                       </>
                     )}
                   </div>